@@ -1,18 +1,26 @@
 # Qcodes driver Keithley 6430 SMU
 # Based on QtLab legacy driver
 # https://github.com/qdev-dk/qtlab/blob/master/instrument_plugins/Keithley_6430.py
-from typing import List, Tuple
+from time import monotonic
+from typing import List, Optional, Set, Tuple
 
+import numpy as np
 from qcodes.instrument.visa import VisaInstrument
 from qcodes.utils.validators import Ints, Numbers, Bool, Strings, Enum
 from qcodes.utils.helpers import create_on_off_val_mapping
 import logging
 import warnings
 from functools import partial
+from itertools import chain, combinations
 
 log = logging.getLogger(__name__)
 
 on_off_vals = create_on_off_val_mapping(on_val=1, off_val=0)
+# Validators are stateless, so the generic ones are shared by all parameters
+# and instances.
+ints_vals = Ints()
+strings_vals = Strings()
+bool_vals = Bool()
 
 
 class Keithley_6430(VisaInstrument):
@@ -25,13 +33,39 @@ class Keithley_6430(VisaInstrument):
         address: Network address or alias of the instrument
         terminator: Termination character in VISA communication
         reset: resets to default values
+        read_cache_ttl: Time in seconds during which ``sense_current``,
+            ``sense_voltage``, ``sense_resistance`` and ``sense_all`` may
+            share one reading, as long as no command is written in between.
+            Each quantity uses a reading at most once, so repeated gets of
+            the same parameter always trigger a new reading. Defaults to 0,
+            which triggers a new reading on every get.
     """
+    _autorange_on = ('SENS:CURR:RANG:AUTO 1;:SENS:VOLT:RANG:AUTO 1;'
+                     ':SENS:RES:RANG:AUTO 1')
+    _autorange_off = ('SENS:CURR:RANG:AUTO 0;:SENS:VOLT:RANG:AUTO 0;'
+                      ':SENS:RES:RANG:AUTO 0')
+    _sense_modes = ('VOLT:DC', 'CURR:DC', 'RES')
+    # Command enabling each combination of sense modes
+    _sense_func_cmds = {
+        frozenset(c): ':SENS:FUNC:OFF:ALL;:SENS:FUNC '
+                      + ','.join(f'"{m}"' for m in c)
+        for c in chain(combinations(_sense_modes, 1),
+                       combinations(_sense_modes, 2),
+                       combinations(_sense_modes, 3))
+    }
+
     def __init__(self, name: str,
                  address: str,
                  terminator="\n",
                  reset: bool = False,
+                 read_cache_ttl: float = 0,
                  **kwargs):
 
+        self.read_cache_ttl = read_cache_ttl
+        self._last_reading: Optional[Tuple[float, float, float]] = None
+        self._last_reading_time = 0.
+        self._last_reading_used: Set[str] = set()
+
         super().__init__(name, address, terminator=terminator, **kwargs)
 
         self.add_parameter('source_current_compliance',
@@ -97,6 +131,14 @@ class Keithley_6430(VisaInstrument):
                            docstring='Value of measured resistance, when in '
                                      'resistance sensing mode.',
                            )
+        self.add_parameter('sense_all',
+                           label='Measured voltage, current and resistance',
+                           get_cmd=self._cached_read,
+                           snapshot_get=False,
+                           docstring='Tuple of measured voltage (V), '
+                                     'current (A) and resistance (Ohm) '
+                                     'from a single reading.',
+                           )
         self.add_parameter('source_current_range',
                            unit='A',
                            get_parser=float,
@@ -146,7 +188,7 @@ class Keithley_6430(VisaInstrument):
                            )
         self.add_parameter('output_auto_off_enabled',
                            set_cmd=':SOUR:CLE:AUTO {}',
-                           get_cmd='OUTP?',
+                           get_cmd=':SOUR:CLE:AUTO?',
                            val_mapping=on_off_vals,
                            )
         self.add_parameter('source_mode',
@@ -159,7 +201,7 @@ class Keithley_6430(VisaInstrument):
         self.add_parameter('sense_mode',
                            set_cmd=self._set_sense_mode,
                            get_cmd=self._get_sense_mode,
-                           vals=Strings(),
+                           vals=strings_vals,
                            docstring="Sensing mode."
                                      "Set to 'VOLT:DC', "
                                      "'CURR:DC', or 'RES', or a combination "
@@ -168,7 +210,7 @@ class Keithley_6430(VisaInstrument):
         self.add_parameter('sense_autorange',
                            set_cmd=self._set_sense_autorange,
                            get_cmd=self._get_sense_autorange,
-                           vals=Bool(),
+                           vals=bool_vals,
                            docstring="If True, all ranges in all modes are"
                                      " chosen automatically",
                            )
@@ -219,13 +261,13 @@ class Keithley_6430(VisaInstrument):
         self.add_parameter('trigger_count',
                            set_cmd=':TRIG:COUN {}',
                            get_cmd=':TRIG:COUN?',
-                           vals=Ints(),
+                           vals=ints_vals,
                            docstring="How many times to trigger.",
                            )
         self.add_parameter('arm_count',
                            set_cmd=':ARM:COUN {}',
                            get_cmd=':ARM:COUN?',
-                           vals=Ints(),
+                           vals=ints_vals,
                            docstring="How many times to arm.",
                            )
         self.add_parameter('nplc',
@@ -238,7 +280,7 @@ class Keithley_6430(VisaInstrument):
                            )
         self.add_parameter('digits',
                            get_parser=int,
-                           set_cmd='DISP:DIG  {}',
+                           set_cmd='DISP:DIG {}',
                            get_cmd='DISP:DIG?',
                            vals=Ints(4, 7),
                            docstring="Display resolution.",
@@ -279,7 +321,7 @@ class Keithley_6430(VisaInstrument):
                            get_parser=int,
                            set_cmd=':AVER:REP:COUN {}',
                            get_cmd=':AVER:REP:COUN?',
-                           vals=Ints(),
+                           vals=ints_vals,
                            docstring="Number of readings that are acquired"
                                      "and stored in the filter buffer.",
                            )
@@ -287,7 +329,7 @@ class Keithley_6430(VisaInstrument):
                            get_parser=int,
                            set_cmd=':MED:RANK {}',
                            get_cmd=':MED:RANK?',
-                           vals=Ints(),
+                           vals=ints_vals,
                            docstring="Number of reading samples"
                                      " for the median filter process.",
                            )
@@ -295,7 +337,7 @@ class Keithley_6430(VisaInstrument):
                            get_parser=int,
                            set_cmd=':AVER:COUN {}',
                            get_cmd=':AVER:COUN?',
-                           vals=Ints(),
+                           vals=ints_vals,
                            docstring="Number of reading samples"
                                      " in the moving average filter.",
                            )
@@ -310,25 +352,116 @@ class Keithley_6430(VisaInstrument):
         Resets instrument to default values
         """
         self.write('*RST')
+        for param in self.parameters.values():
+            param.cache.invalidate()
 
     def read(self) -> Tuple[float, float, float]:
         """
         Arm, trigger, and readout. Note that the values may not be valid if
         sense mode doesn't include them.
+        The output state is checked against the cached ``output_enabled``
+        value. If the instrument turned its output off by itself (auto
+        output-off, compliance or interlock), invalidate that cache first,
+        otherwise the reading is taken from the disabled output instead of
+        raising.
+        Returns:
+            tuple of (voltage (V), current (A), resistance (Ohm))
+        """
+        self._check_output_enabled()
+        s = self.ask(':READ?')
+        logging.debug(f'Read: {s}')
+
+        v, i, r = [float(n) for n in s.split(',')][:3]
+        return v, i, r
+
+    def fetch(self) -> Tuple[float, float, float]:
+        """
+        Readout of the latest reading without triggering a new one. Together
+        with ``init`` this allows overlapping measurements of several
+        instruments: call ``init`` on all of them, then ``fetch`` on each.
         Returns:
             tuple of (voltage (V), current (A), resistance (Ohm))
         """
-        if not (self.output_enabled() or self.output_auto_off_enabled()):
+        s = self.ask(':FETC?')
+        logging.debug(f'Fetch: {s}')
+
+        v, i, r = [float(n) for n in s.split(',')][:3]
+        return v, i, r
+
+    def read_many(self, n: int) -> np.ndarray:
+        """
+        Acquire ``n`` readings into the internal trace buffer with a single
+        trigger sequence and read them out in one transfer. The VISA timeout
+        has to be long enough to cover the whole acquisition. The trigger
+        count is restored afterwards.
+        Args:
+            n: number of readings, at most 2500
+        Returns:
+            array of shape (n, 3) with columns voltage (V), current (A) and
+            resistance (Ohm)
+        """
+        if not 1 <= n <= 2500:
+            raise ValueError(f'n must be between 1 and 2500, got {n}')
+        self._check_output_enabled()
+        trigger_count = int(self.trigger_count.cache.get())
+        self.write(f':TRAC:CLE;:TRAC:POIN {n};:TRAC:FEED SENS;'
+                   f':TRAC:FEED:CONT NEXT;:TRIG:COUN {n}')
+        self.trigger_count.cache.set(n)
+        try:
+            self.write(':INIT')
+            self.ask('*OPC?')
+            s = self.ask(':TRAC:DATA?')
+        finally:
+            self.trigger_count(trigger_count)
+        logging.debug(f'Read buffer: {s}')
+
+        data = np.fromstring(s, dtype=np.float64, sep=',')
+        return data.reshape(n, -1)[:, :3]
+
+    def flush_buffer(self) -> None:
+        """
+        Clear the trace buffer and stop feeding readings into it.
+        """
+        self.write(':TRAC:CLE;:TRAC:FEED:CONT NEV')
+
+    def _check_output_enabled(self) -> None:
+        """
+        Raise if neither the source is on nor auto output-off is enabled,
+        as no reading can be taken in that case. Uses the parameter caches,
+        so an output the instrument switched off by itself is not detected.
+        """
+        if not (self.output_enabled.cache.get()
+                or self.output_auto_off_enabled.cache.get()):
             raise Exception(
                     "Either source must be turned on manually or "
                     "``output_auto_off_enabled`` has to be enabled before "
                     "measuring a sense parameter."
                     )
-        s = self.ask(':READ?')
-        logging.debug(f'Read: {s}')
 
-        v, i, r = [float(n) for n in s.split(',')][:3]
-        return v, i, r
+    def write_raw(self, cmd: str) -> None:
+        # Any command may change what a new reading would return
+        self._last_reading = None
+        super().write_raw(cmd)
+
+    def _cached_read(self, quantities: Tuple[str, ...] = _sense_modes
+                     ) -> Tuple[float, float, float]:
+        """
+        Same as ``read``, but reuses the last reading if it is younger than
+        ``read_cache_ttl``, no command has been written since and none of
+        the requested quantities has been taken from it yet.
+        Args:
+            quantities: the quantities the caller uses from the reading
+        """
+        reading = self._last_reading
+        if (reading is None
+                or monotonic() - self._last_reading_time >= self.read_cache_ttl
+                or not self._last_reading_used.isdisjoint(quantities)):
+            reading = self.read()
+            self._last_reading = reading
+            self._last_reading_time = monotonic()
+            self._last_reading_used = set()
+        self._last_reading_used.update(quantities)
+        return reading
 
     def _read_value(self, quantity: str) -> float:
         """
@@ -340,17 +473,18 @@ class Keithley_6430(VisaInstrument):
         Returns:
             Measured value of the requested quantity.
         """
-        mode_now = self.sense_mode()
+        mode_now = self.sense_mode.cache.get()
         if quantity not in mode_now:
             warnings.warn(f"{self.short_name} tried reading {quantity}, but "
                           f"mode is set to {mode_now}. Value might be out of "
                           f"date.")
         mapping = {"VOLT:DC": 0, "CURR:DC": 1, "RES": 2}
-        return self.read()[mapping[quantity]]
+        return self._cached_read((quantity,))[mapping[quantity]]
 
     def init(self) -> None:
         """
-        Go into the arm/trigger layers from the idle mode.
+        Go into the arm/trigger layers from the idle mode. The readings can
+        be retrieved with ``fetch`` once the acquisition has completed.
         """
         self.write(':INIT')
 
@@ -368,18 +502,15 @@ class Keithley_6430(VisaInstrument):
             mode: mode(s) to be set. Choose from self._sense_modes.
             Use comma to separate multiple modes.
         """
+        self.sense_mode.cache.invalidate()
 
         modes = [m.strip(' ') for m in mode.split(',')]
 
-        if not all([m in ["RES", "CURR:DC", "VOLT:DC"] for m in modes]):
+        cmd = self._sense_func_cmds.get(frozenset(modes))
+        if cmd is None:
             raise ValueError(f'invalid sense_mode {modes}')
 
-        modes_str = '"' + '","'.join(modes) + '"'
-
-        string = f':SENS:FUNC {modes_str}'
-
-        self.write(':SENS:FUNC:OFF:ALL')
-        self.write(string)
+        self.write(cmd)
 
     def _get_sense_mode(self) -> str:
         """
@@ -401,16 +532,13 @@ class Keithley_6430(VisaInstrument):
         """
         Switch sense_autorange on or off for all modes.
         """
-        n = int(val)
-        self.write(f'SENS:CURR:RANG:AUTO {n}')
-        self.write(f'SENS:VOLT:RANG:AUTO {n}')
-        self.write(f'SENS:RES:RANG:AUTO {n}')
+        self.write(self._autorange_on if val else self._autorange_off)
 
     def _get_sense_autorange(self) -> bool:
         """
         Get status of sense_autorange. Returns true iff true for all modes
         """
-        reply0 = bool(int(self.ask('SENS:CURR:RANG:AUTO?')))
-        reply1 = bool(int(self.ask('SENS:VOLT:RANG:AUTO?')))
-        reply2 = bool(int(self.ask('SENS:RES:RANG:AUTO?')))
-        return reply0 and reply1 and reply2
+        reply = self.ask('SENS:CURR:RANG:AUTO?;'
+                         ':SENS:VOLT:RANG:AUTO?;'
+                         ':SENS:RES:RANG:AUTO?')
+        return all(int(r) for r in reply.split(';'))
@@ -104,6 +104,9 @@ class Thorlabs_APT:
         """
         devices = []
         count = ctypes.c_long()
+        count_ref = ctypes.byref(count)
+        serial_number = ctypes.c_long()
+        serial_number_ref = ctypes.byref(serial_number)
 
         if hw_type is not None:
             # Only search for devices of the passed hardware type (model)
@@ -115,14 +118,15 @@ class Thorlabs_APT:
             # Search for all models
             hw_type_range = list(range(100))
 
+        get_num_hw_units = self.dll.GetNumHWUnitsEx
+        get_hw_serial_num = self.dll.GetHWSerialNumEx
         for hw_type_id in hw_type_range:
             # Get number of devices of the specific hardware type
-            if self.dll.GetNumHWUnitsEx(hw_type_id, ctypes.byref(count)) == 0 and count.value > 0:
+            if get_num_hw_units(hw_type_id, count_ref) == 0 and count.value > 0:
                 # Is there any device of the specified hardware type
-                serial_number = ctypes.c_long()
                 # Get the serial numbers of all devices of that hardware type
                 for ii in range(count.value):
-                    if self.dll.GetHWSerialNumEx(hw_type_id, ii, ctypes.byref(serial_number)) == 0:
+                    if get_hw_serial_num(hw_type_id, ii, serial_number_ref) == 0:
                         devices.append((hw_type_id, ii, serial_number.value))
 
         return devices
@@ -6,16 +6,30 @@ Authors:
 """
 import ctypes
 import logging
-from time import sleep, time
-from typing import Optional
+from time import monotonic, sleep, time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
 from qcodes.parameters import Parameter
 from qcodes import validators as vals
 
-from .kinesis import _Thorlabs_Kinesis
+from .kinesis import _HARDWARE_INFO_ARGTYPES, _Thorlabs_Kinesis
 
 log = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# Kinesis values of the jog, stop and soft limits modes and travel directions
+_JOG_MODES = {'continuous': 0x01, 'stepped': 0x02}
+_STOP_MODES = {'immediate': 0x01, 'profiled': 0x02}
+_SOFT_LIMITS_MODES = {'disallow': 0, 'partial': 1, 'all': 2}
+_DIRECTIONS = {'forward': 0x01, 'forwards': 0x01,
+               'reverse': 0x02, 'backward': 0x02, 'backwards': 0x02}
+_JOG_MODES_INV = {v: k for k, v in _JOG_MODES.items()}
+_STOP_MODES_INV = {v: k for k, v in _STOP_MODES.items()}
+_SOFT_LIMITS_MODES_INV = {v: k for k, v in _SOFT_LIMITS_MODES.items()}
+# Status bits 0x10 (moving clockwise) and 0x20 (moving counterclockwise)
+_MOVING_MASK = 0x30
+
 class _Thorlabs_CC(_Thorlabs_Kinesis):
     """Instrument driver for Thorlabs instruments using the CC commands
 
@@ -29,6 +43,40 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         home: Sets the device to home state. Defaults to False.
     """
     _CONDITIONS = ['homed', 'moved', 'stopped', 'limit_updated']
+    _prefix = 'CC'
+    _dll_signatures = {
+        'CC_GetPosition': ([ctypes.c_char_p], ctypes.c_int),
+        'CC_SetMoveAbsolutePosition': ([ctypes.c_char_p, ctypes.c_int],
+                                       ctypes.c_short),
+        'CC_MoveAbsolute': ([ctypes.c_char_p], ctypes.c_short),
+        'CC_MoveToPosition': ([ctypes.c_char_p, ctypes.c_int], ctypes.c_short),
+        'CC_MoveRelative': ([ctypes.c_char_p, ctypes.c_int], ctypes.c_short),
+        'CC_MoveAtVelocity': ([ctypes.c_char_p, ctypes.c_short],
+                              ctypes.c_short),
+        'CC_MoveJog': ([ctypes.c_char_p, ctypes.c_short], ctypes.c_short),
+        'CC_GetVelParams': ([ctypes.c_char_p, ctypes.POINTER(ctypes.c_int),
+                             ctypes.POINTER(ctypes.c_int)], ctypes.c_short),
+        'CC_SetVelParams': ([ctypes.c_char_p, ctypes.c_int, ctypes.c_int],
+                            ctypes.c_short),
+        'CC_GetJogVelParams': ([ctypes.c_char_p, ctypes.POINTER(ctypes.c_int),
+                                ctypes.POINTER(ctypes.c_int)], ctypes.c_short),
+        'CC_SetJogVelParams': ([ctypes.c_char_p, ctypes.c_int, ctypes.c_int],
+                               ctypes.c_short),
+        'CC_GetRealValueFromDeviceUnit': (
+            [ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(ctypes.c_double),
+             ctypes.c_int], ctypes.c_short),
+        'CC_GetDeviceUnitFromRealValue': (
+            [ctypes.c_char_p, ctypes.c_double, ctypes.POINTER(ctypes.c_int),
+             ctypes.c_int], ctypes.c_short),
+        'CC_GetStatusBits': ([ctypes.c_char_p], ctypes.c_ulong),
+        'CC_GetHardwareInfo': (_HARDWARE_INFO_ARGTYPES, ctypes.c_short),
+        'CC_MessageQueueSize': ([ctypes.c_char_p], ctypes.c_int),
+        'CC_WaitForMessage': (
+            [ctypes.c_char_p, ctypes.POINTER(ctypes.c_ushort),
+             ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(ctypes.c_ulong)],
+            ctypes.c_bool),
+    }
+
     def __init__(self,
                  name: str,
                  serial_number: str,
@@ -43,6 +91,15 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
                          self._dll_path, dll_dir, simulation,
                          **kwargs)
 
+        self._polling = polling
+        # DLL function name: (time, result) of the polled reads
+        self._polled: Dict[str, Tuple[float, Any]] = {}
+        # Out-parameters reused by the frequently called DLL functions
+        self._real_unit = ctypes.c_double()
+        self._device_unit = ctypes.c_int()
+        self._accel_buf = ctypes.c_int()
+        self._vel_buf = ctypes.c_int()
+
         if self._dll.TLI_BuildDeviceList() == 0:
             self._dll.CC_Open(self._serial_number)
             self._start_polling(polling)
@@ -136,6 +193,16 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
             instrument=self
         )
 
+        self.vel_params = Parameter(
+            'vel_params',
+            label='Move velocity and acceleration',
+            set_cmd=self._set_move_vel_params,
+            get_cmd=self._get_move_vel_params,
+            docstring='Tuple of move velocity and acceleration, '
+                      'set together in a single call.',
+            instrument=self
+        )
+
         self.jog_acceleration = Parameter(
             'jog_acceleration',
             label='Jog acceleration',
@@ -189,16 +256,6 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
 
         self.connect_message()
 
-    def identify(self) -> None:
-        """Sends a command to the device to make it identify itself"""
-        self.log.debug('identify the device')
-        self._dll.CC_Identify(self._serial_number)
-
-    def get_idn(self) -> dict:
-        """Get device identifier"""
-        idparts = ['Thorlabs', self.model, self.version, self.serial_number]
-        return dict(zip(('vendor', 'model', 'serial', 'firmware'), idparts))
-
     def go_home(self, block=True):
         """Home the device: set the device to a known state and home position
 
@@ -206,6 +263,7 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
             block: will wait for completion. Defaults to True.
         """
         self.log.info('home the device.')
+        self._invalidate_poll('CC_GetStatusBits')
         self._check_error(self._dll.CC_Home(self._serial_number))
         self.homed = True
         if block:
@@ -223,6 +281,8 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         message_id = ctypes.c_ushort()
         message_data = ctypes.c_ulong()
         cond = self._CONDITIONS.index(status)
+        # the message queue is only filled when the DLL polls the device
+        interval = max(self._polling, 10) * 1e-3
 
         if status == 'stopped':
             if not self.is_moving():
@@ -230,13 +290,16 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         elif status == 'homed':
             max_time = 0
 
-        while self._dll.CC_MessageQueueSize(self._serial_number) <= 0:
-            sleep(.2)
+        serial_number = self._serial_number
+        queue_size = self._dll.CC_MessageQueueSize
+        wait_for_message = self._dll.CC_WaitForMessage
+        message_refs = (ctypes.byref(message_type), ctypes.byref(message_id),
+                        ctypes.byref(message_data))
 
-        self._dll.CC_WaitForMessage(
-            self._serial_number, ctypes.byref(message_type),
-            ctypes.byref(message_id), ctypes.byref(message_data)
-        )
+        while queue_size(serial_number) <= 0:
+            sleep(interval)
+
+        wait_for_message(serial_number, *message_refs)
 
         start = time()
         while int(message_type.value) != 2 or int(message_id.value) != cond:
@@ -245,15 +308,10 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
                 raise RuntimeError(f'waited for {max_time} for {status} to complete'
                                    f'message type: {message_type.value} ({message_id.value})')
 
-            if self._dll.CC_MessageQueueSize(self._serial_number) <= 0:
-                sleep(.2)
+            if queue_size(serial_number) <= 0:
+                sleep(interval)
                 continue
-            self._dll.CC_WaitForMessage(
-                self._serial_number,
-                ctypes.byref(message_type),
-                ctypes.byref(message_id),
-                ctypes.byref(message_data)
-            )
+            wait_for_message(serial_number, *message_refs)
         return None
 
     def _device_unit_to_real(self, device_unit: int, unit_type: int) -> float:
@@ -266,13 +324,12 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         Returns:
             float: real unit value
         """
-        real_unit = ctypes.c_double()
         ret = self._dll.CC_GetRealValueFromDeviceUnit(
-            self._serial_number, ctypes.c_int(device_unit),
-            ctypes.byref(real_unit), ctypes.c_int(unit_type)
+            self._serial_number, device_unit, ctypes.byref(self._real_unit),
+            unit_type
         )
         self._check_error(ret)
-        return real_unit.value
+        return self._real_unit.value
 
     def _real_to_device_unit(self, real_unit: float, unit_type: int) -> int:
         """Converts a real world unit to a device unit
@@ -284,13 +341,12 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         Returns:
             int: device unit
         """
-        device_unit = ctypes.c_int()
         ret = self._dll.CC_GetDeviceUnitFromRealValue(
-            self._serial_number, ctypes.c_double(real_unit),
-            ctypes.byref(device_unit), ctypes.c_int(unit_type)
+            self._serial_number, real_unit, ctypes.byref(self._device_unit),
+            unit_type
         )
         self._check_error(ret)
-        return device_unit.value
+        return self._device_unit.value
 
     def _get_backlash(self) -> float:
         """Get the backlash distance setting (used to control hysteresis)"""
@@ -320,26 +376,14 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
                                       ctypes.byref(jog_mode),
                                       ctypes.byref(stop_mode))
         self._check_error(ret)
-        if jog_mode.value == ctypes.c_short(0x01).value:
-            return 'continuous'
-        elif jog_mode.value == ctypes.c_short(0x02).value:
-            return 'stepped'
-        else:
+        try:
+            return _JOG_MODES_INV[jog_mode.value]
+        except KeyError:
             raise RuntimeError('Unexpected value received from Kinesis')
 
     def _set_jog_mode(self, mode: str) -> None:
-        jog_mode = ctypes.c_short(0x00)
-        stop_mode = ctypes.c_short(0x00)
-        stop_mode = self._get_stop_mode()
-
-        if mode == 'continuous':
-            jog_mode = ctypes.c_short(0x01)
-        elif mode == 'stepped':
-            jog_mode = ctypes.c_short(0x02)
-        if stop_mode == 'immediate':
-            stop_mode = ctypes.c_short(0x01)
-        elif stop_mode == 'profiled':
-            stop_mode = ctypes.c_short(0x02)
+        jog_mode = ctypes.c_short(_JOG_MODES[mode])
+        stop_mode = ctypes.c_short(_STOP_MODES[self.stop_mode.cache.get()])
 
         ret = self._dll.CC_SetJogMode(self._serial_number,
                                       jog_mode, stop_mode)
@@ -368,26 +412,14 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
                                       ctypes.byref(jog_mode),
                                       ctypes.byref(stop_mode))
         self._check_error(ret)
-        if stop_mode.value == ctypes.c_short(0x01).value:
-            return 'immediate'
-        elif stop_mode.value == ctypes.c_short(0x02).value:
-            return 'profiled'
-        else:
+        try:
+            return _STOP_MODES_INV[stop_mode.value]
+        except KeyError:
             raise RuntimeError('unexpected value received from Kinesis')
 
     def _set_stop_mode(self, mode: str) -> None:
-        jog_mode = ctypes.c_short(0x00)
-        stop_mode = ctypes.c_short(0x00)
-
-        jmode = self._get_jog_mode()
-        if jmode == 'continuous':
-            jog_mode = ctypes.c_short(0x01)
-        elif jmode == 'stepped':
-            jog_mode = ctypes.c_short(0x02)
-        if mode == 'immediate':
-            stop_mode = ctypes.c_short(0x01)
-        elif mode == 'profiled':
-            stop_mode = ctypes.c_short(0x02)
+        jog_mode = ctypes.c_short(_JOG_MODES[self.jog_mode.cache.get()])
+        stop_mode = ctypes.c_short(_STOP_MODES[mode])
 
         ret = self._dll.CC_SetJogMode(self._serial_number,
                                       jog_mode, stop_mode)
@@ -428,95 +460,111 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         """Gets the software limits mode."""
         mode = ctypes.c_int16()
         self._dll.CC_GetSoftLimitMode(self._serial_number, ctypes.byref(mode))
-        if mode.value == ctypes.c_int16(0).value:
-            return 'disallow'
-        elif mode.value == ctypes.c_int16(1).value:
-            return 'partial'
-        elif mode.value == ctypes.c_int16(2).value:
-            return 'all'
-        else:
+        try:
+            return _SOFT_LIMITS_MODES_INV[mode.value]
+        except KeyError:
             raise RuntimeError('unexpected value received from Kinesis')
 
     def _set_soft_limits_mode(self, mode: str) -> None:
         """Sets the software limits mode"""
-        if mode == 'disallow':
-            lmode = ctypes.c_int16(0)
-        elif mode == 'partial':
-            lmode = ctypes.c_int16(1)
-        elif mode == 'all':
-            lmode = ctypes.c_int16(2)
+        lmode = ctypes.c_int16(_SOFT_LIMITS_MODES[mode])
 
         ret = self._dll.CC_SetLimitsSoftwareApproachPolicy(self._serial_number,
                                                            lmode)
         self._check_error(ret)
 
-    def _get_move_velocity(self) -> float:
-        acceleration = ctypes.c_int()
-        velocity = ctypes.c_int()
-        ret = self._dll.CC_GetVelParams(self._serial_number,
-                                        ctypes.byref(acceleration),
-                                        ctypes.byref(velocity))
+    def _poll(self, name: str, read: Callable[[], T]) -> T:
+        """Return ``read()``, the result of the DLL function ``name``. The DLL
+        only updates its values once per polling period, so the result is
+        reused within one period unless invalidated in between.
+        """
+        now = monotonic()
+        cached = self._polled.get(name)
+        if cached is not None and now - cached[0] < self._polling * 1e-3:
+            return cached[1]
+        value = read()
+        self._polled[name] = (now, value)
+        return value
+
+    def _invalidate_poll(self, name: str) -> None:
+        """Discard the cached result of the DLL function ``name``"""
+        self._polled.pop(name, None)
+
+    def _read_accel_vel(self, name: str) -> Tuple[int, int]:
+        """Read an (acceleration, velocity) pair in device units with the
+        DLL function ``name``"""
+        ret = getattr(self._dll, name)(self._serial_number,
+                                       ctypes.byref(self._accel_buf),
+                                       ctypes.byref(self._vel_buf))
         self._check_error(ret)
-        return self._device_unit_to_real(velocity.value, 1)
+        return self._accel_buf.value, self._vel_buf.value
+
+    def _get_vel_params(self) -> Tuple[int, int]:
+        """Get the move acceleration and velocity in device units"""
+        return self._poll('CC_GetVelParams',
+                          lambda: self._read_accel_vel('CC_GetVelParams'))
+
+    def _get_move_velocity(self) -> float:
+        return self._device_unit_to_real(self._get_vel_params()[1], 1)
 
     def _set_move_velocity(self, velocity: float) -> None:
-        vel = self._real_to_device_unit(velocity, 1)
-        accel = self._real_to_device_unit(self._get_move_acceleration(), 2)
-        ret = self._dll.CC_SetVelParams(self._serial_number,
-                                        ctypes.c_int(accel),
-                                        ctypes.c_int(vel))
-        self._check_error(ret)
+        self._write_vel_params(velocity, self.acceleration.cache.get())
 
     def _get_move_acceleration(self) -> float:
-        acceleration = ctypes.c_int()
-        velocity = ctypes.c_int()
-        ret = self._dll.CC_GetVelParams(self._serial_number,
-                                        ctypes.byref(acceleration),
-                                        ctypes.byref(velocity))
-        self._check_error(ret)
-        return self._device_unit_to_real(acceleration.value, 2)
+        return self._device_unit_to_real(self._get_vel_params()[0], 2)
 
     def _set_move_acceleration(self, acceleration: float) -> None:
-        vel = self._real_to_device_unit(self._get_move_velocity(), 1)
+        self._write_vel_params(self.velocity.cache.get(), acceleration)
+
+    def _get_move_vel_params(self) -> Tuple[float, float]:
+        accel, vel = self._get_vel_params()
+        return (self._device_unit_to_real(vel, 1),
+                self._device_unit_to_real(accel, 2))
+
+    def _set_move_vel_params(self, params: Tuple[float, float]) -> None:
+        velocity, acceleration = params
+        self.velocity.validate(velocity)
+        self.acceleration.validate(acceleration)
+        self._write_vel_params(velocity, acceleration)
+        self.velocity.cache.set(velocity)
+        self.acceleration.cache.set(acceleration)
+
+    def _write_vel_params(self, velocity: float, acceleration: float) -> None:
+        """Write the move velocity and acceleration in a single DLL call.
+        The values are not validated, so that the value not being set is
+        written back as the device holds it."""
+        vel = self._real_to_device_unit(velocity, 1)
         accel = self._real_to_device_unit(acceleration, 2)
-        ret = self._dll.CC_SetVelParams(self._serial_number,
-                                        ctypes.c_int(accel),
-                                        ctypes.c_int(vel))
+        self._invalidate_poll('CC_GetVelParams')
+        ret = self._dll.CC_SetVelParams(self._serial_number, accel, vel)
         self._check_error(ret)
+        self.vel_params.cache.set((velocity, acceleration))
 
-    def _get_jog_velocity(self) -> float:
-        acceleration = ctypes.c_int()
-        velocity = ctypes.c_int()
-        ret = self._dll.CC_GetJogVelParams(self._serial_number,
-                                           ctypes.byref(acceleration),
-                                           ctypes.byref(velocity))
+    def _get_jog_vel_params(self) -> Tuple[int, int]:
+        """Get the jog acceleration and velocity in device units"""
+        return self._poll('CC_GetJogVelParams',
+                          lambda: self._read_accel_vel('CC_GetJogVelParams'))
+
+    def _set_jog_vel_params(self, accel: int, vel: int) -> None:
+        self._invalidate_poll('CC_GetJogVelParams')
+        ret = self._dll.CC_SetJogVelParams(self._serial_number, accel, vel)
         self._check_error(ret)
-        return self._device_unit_to_real(velocity.value, 1)
+
+    def _get_jog_velocity(self) -> float:
+        return self._device_unit_to_real(self._get_jog_vel_params()[1], 1)
 
     def _set_jog_velocity(self, velocity: float) -> None:
         vel = self._real_to_device_unit(velocity, 1)
-        accel = self._real_to_device_unit(self._get_jog_acceleration(), 2)
-        ret = self._dll.CC_SetJogVelParams(self._serial_number,
-                                           ctypes.c_int(accel),
-                                           ctypes.c_int(vel))
-        self._check_error(ret)
+        accel = self._real_to_device_unit(self.jog_acceleration.cache.get(), 2)
+        self._set_jog_vel_params(accel, vel)
 
     def _get_jog_acceleration(self) -> float:
-        acceleration = ctypes.c_int()
-        velocity = ctypes.c_int()
-        ret = self._dll.CC_GetJogVelParams(self._serial_number,
-                                           ctypes.byref(acceleration),
-                                           ctypes.byref(velocity))
-        self._check_error(ret)
-        return self._device_unit_to_real(acceleration.value, 2)
+        return self._device_unit_to_real(self._get_jog_vel_params()[0], 2)
 
     def _set_jog_acceleration(self, acceleration: float) -> None:
-        vel = self._real_to_device_unit(self._get_jog_velocity(), 1)
+        vel = self._real_to_device_unit(self.jog_velocity.cache.get(), 1)
         accel = self._real_to_device_unit(acceleration, 2)
-        ret = self._dll.CC_SetJogVelParams(self._serial_number,
-                                           ctypes.c_int(accel),
-                                           ctypes.c_int(vel))
-        self._check_error(ret)
+        self._set_jog_vel_params(accel, vel)
 
     def _get_position(self) -> float:
         pos = self._dll.CC_GetPosition(self._serial_number)
@@ -524,29 +572,29 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
 
     def _set_position(self, position: float, block: bool=True) -> None:
         pos = self._real_to_device_unit(position, 0)
-        ret = self._dll.CC_SetMoveAbsolutePosition(self._serial_number,
-                                                   ctypes.c_int(pos))
+        ret = self._dll.CC_SetMoveAbsolutePosition(self._serial_number, pos)
         self._check_error(ret)
+        self._invalidate_poll('CC_GetStatusBits')
         ret = self._dll.CC_MoveAbsolute(self._serial_number)
         self._check_error(ret)
         if block:
+            interval = max(self._polling, 10) * 1e-3
             diff = abs(self._get_position() - position)
             diff -= 360 if diff > 180 else diff
             while abs(diff) > .001:
-                sleep(.2)
+                sleep(interval)
                 diff = abs(self._get_position() - position)
                 diff -= 360 if diff > 180 else diff
 
+    def _get_status_bits(self) -> int:
+        """Get the status bits of the device"""
+        return self._poll('CC_GetStatusBits',
+                          lambda: self._dll.CC_GetStatusBits(self._serial_number))
+
     def is_moving(self) -> bool:
         """check if the motor cotnroller is moving."""
         self.log.info('check if the motor is moving')
-        status_bit = ctypes.c_short()
-        self._dll.CC_GetStatusBits(self._serial_number,
-                                   ctypes.byref(status_bit))
-        if status_bit.value & 0x10 or status_bit.value & 0x20:
-            return True
-        else:
-            return False
+        return bool(self._get_status_bits() & _MOVING_MASK)
 
     def move_to(self, position: float, block=True) -> None:
         """Move the device to the specified position.
@@ -558,8 +606,8 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         """
         self.log.info(f'move to {position}')
         pos = self._real_to_device_unit(position, 0)
-        ret = self._dll.CC_MoveToPosition(self._serial_number,
-                                          ctypes.c_int(pos))
+        self._invalidate_poll('CC_GetStatusBits')
+        ret = self._dll.CC_MoveToPosition(self._serial_number, pos)
         self._check_error(ret)
 
         if block:
@@ -575,8 +623,8 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         """
         self.log.info(f'move by {displacement}')
         dis = self._real_to_device_unit(displacement, 0)
-        ret = self._dll.CC_MoveRelative(self._serial_number,
-                                        ctypes.c_int(dis))
+        self._invalidate_poll('CC_GetStatusBits')
+        ret = self._dll.CC_MoveRelative(self._serial_number, dis)
         self._check_error(ret)
         if block:
             self.wait_for_completion(status='moved')
@@ -590,14 +638,11 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
                 Defaults to 'forward'. Accepts 'forward' or 'reverse'
         """
         self.log.info(f'move continuously. direction: {direction}')
-        if direction == 'forward' or direction == 'forwards':
-            direc = ctypes.c_short(0x01)
-        elif direction == 'reverse' or direction == 'backward' or direction == 'backwards':
-            direc = ctypes.c_short(0x02)
-        else:
+        if direction not in _DIRECTIONS:
             raise ValueError('direction unrecognised')
-
-        ret = self._dll.CC_MoveAtVelocity(self._serial_number, direc)
+        self._invalidate_poll('CC_GetStatusBits')
+        ret = self._dll.CC_MoveAtVelocity(self._serial_number,
+                                          _DIRECTIONS[direction])
         self._check_error(ret)
         self.position.get()
 
@@ -610,14 +655,10 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
             block: will wait until complete. Defaults to True.
         """
         self.log.info(f'perform a jog; direction: {direction}')
-        if direction == 'forward' or direction == 'forwards':
-            direc = ctypes.c_short(0x01)
-        elif direction == 'reverse' or direction == 'backward' or direction == 'backwards':
-            direc = ctypes.c_short(0x02)
-        else:
+        if direction not in _DIRECTIONS:
             raise ValueError('direction unrecognised')
-
-        ret = self._dll.CC_MoveJog(self._serial_number, direc)
+        self._invalidate_poll('CC_GetStatusBits')
+        ret = self._dll.CC_MoveJog(self._serial_number, _DIRECTIONS[direction])
         self._check_error(ret)
         if self._get_jog_mode() =='stepped':
             if block:
@@ -634,6 +675,7 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
                 Defaults to False.
         """
         self.log.info('stop the current move')
+        self._invalidate_poll('CC_GetStatusBits')
         if immediate:
             ret = self._dll.CC_StopImmediate(self._serial_number)
         else:
@@ -642,51 +684,6 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         self.wait_for_completion(status='stopped')
         self.position.get()
 
-    def close(self):
-        self.log.info('close the device')
-        if self._simulation:
-            self.disable_simulation()
-        if hasattr(self, '_serial_number'):
-            self._stop_polling()
-            self._dll.CC_Close(self._serial_number)
-
-    def _get_hardware_info(self) -> list:
-        """Gets the hardware information from the device
-
-        Returns:
-            list: [model number, hardware type number, number of channels,
-                notes describing the device, firmware version, hardware version,
-                hardware modification state]
-        """
-        model = ctypes.create_string_buffer(8)
-        model_size = ctypes.c_ulong(8)
-        type_num = ctypes.c_ushort()
-        channel_num = ctypes.c_ushort()
-        notes = ctypes.create_string_buffer(48)
-        notes_size = ctypes.c_ulong(48)
-        firmware_version = ctypes.c_ulong()
-        hardware_version = ctypes.c_ushort()
-        modification_state = ctypes.c_ushort()
-
-        ret = self._dll.CC_GetHardwareInfo(
-            self._serial_number,
-            ctypes.byref(model), model_size,
-            ctypes.byref(type_num), ctypes.byref(channel_num),
-            ctypes.byref(notes), notes_size, ctypes.byref(firmware_version),
-            ctypes.byref(hardware_version), ctypes.byref(modification_state)
-        )
-
-        self._check_error(ret)
-        return [model.value, type_num.value, channel_num.value,
-                notes.value, firmware_version.value, hardware_version.value,
-                modification_state.value]
-
-    def _load_settings(self):
-        """Update device with stored settings"""
-        self.log.info('update the device with the stored settings')
-        self._dll.CC_LoadSettings(self._serial_number)
-        return None
-
     def _set_limits_approach(self, limit: int) -> None:
         disallow_illegal_moves = ctypes.c_int16(0)
         allow_partial_moves = ctypes.c_int16(1)
@@ -706,15 +703,6 @@ class _Thorlabs_CC(_Thorlabs_Kinesis):
         self._dll.CC_StartPolling(self._serial_number, ctypes.byref(pol))
         return None
 
-    def _stop_polling(self) -> None:
-        self.log.info('stop polling')
-        self._dll.CC_StopPolling(self._serial_number)
-
-    def _clear_message_queue(self) -> None:
-        self.log.info('clear messages queue')
-        self._dll.CC_ClearMessageQueue(self._serial_number)
-        return None
-
     def _can_home(self) -> bool:
         ret = self._dll.CC_CanHome(self._serial_number)
         return bool(ret)
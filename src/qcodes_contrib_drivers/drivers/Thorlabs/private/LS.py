@@ -13,7 +13,7 @@ from typing import Optional
 from qcodes.parameters import Parameter
 from qcodes import validators as vals
 
-from .kinesis import _Thorlabs_Kinesis
+from .kinesis import _HARDWARE_INFO_ARGTYPES, _Thorlabs_Kinesis
 
 log = logging.getLogger(__name__)
 
@@ -30,6 +30,14 @@ class _Thorlabs_LS(_Thorlabs_Kinesis):
         home: Sets the device to home state. Defaults to False.
     """
     _CONDITIONS = ['homed', 'moved', 'stopped', 'limit_updated']
+    _prefix = 'LS'
+    _dll_signatures = {
+        'LS_GetStatusBits': ([ctypes.c_char_p], ctypes.c_ulong),
+        'LS_GetHardwareInfo': (_HARDWARE_INFO_ARGTYPES, ctypes.c_short),
+        'LS_GetPowerReading': ([ctypes.c_char_p], ctypes.c_ushort),
+        'LS_SetPower': ([ctypes.c_char_p, ctypes.c_ushort], ctypes.c_short),
+    }
+
     def __init__(self,
                  name: str,
                  serial_number: str,
@@ -91,15 +99,6 @@ class _Thorlabs_LS(_Thorlabs_Kinesis):
 
         self.connect_message()
 
-    def identify(self) -> None:
-        """Sends a command to the device to make it identify itself"""
-        self._dll.LS_Identify(self._serial_number)
-
-    def get_idn(self) -> dict:
-        """Get device identifier"""
-        idparts = ['Thorlabs', self.model, self.version, self.serial_number]
-        return dict(zip(('vendor', 'model', 'serial', 'firmware'), idparts))
-
     def _get_status_bits(self) -> int:
         status = self._dll.LS_GetStatusBits(self._serial_number)
         if status == 0x40000000:
@@ -137,49 +136,6 @@ class _Thorlabs_LS(_Thorlabs_Kinesis):
         ret = self._dll.LS_SetPower(self._serial_number, int(percent*max_num))
         self._check_error(ret)
 
-    def close(self):
-        if self._simulation:
-            self.disable_simulation()
-        if hasattr(self, '_serial_number'):
-            self._stop_polling()
-            self._dll.LS_Close(self._serial_number)
-
-    def _get_hardware_info(self) -> list:
-        """Gets the hardware information from the device
-
-        Returns:
-            list: [model number, hardware type number, number of channels,
-                notes describing the device, firmware version, hardware version,
-                hardware modification state]
-        """
-        model = ctypes.create_string_buffer(8)
-        model_size = ctypes.c_ulong(8)
-        type_num = ctypes.c_ushort()
-        channel_num = ctypes.c_ushort()
-        notes = ctypes.create_string_buffer(48)
-        notes_size = ctypes.c_ulong(48)
-        firmware_version = ctypes.c_ulong()
-        hardware_version = ctypes.c_ushort()
-        modification_state = ctypes.c_ushort()
-
-        ret = self._dll.LS_GetHardwareInfo(
-            self._serial_number,
-            ctypes.byref(model), model_size,
-            ctypes.byref(type_num), ctypes.byref(channel_num),
-            ctypes.byref(notes), notes_size, ctypes.byref(firmware_version),
-            ctypes.byref(hardware_version), ctypes.byref(modification_state)
-        )
-
-        self._check_error(ret)
-        return [model.value, type_num.value, channel_num.value,
-                notes.value, firmware_version.value, hardware_version.value,
-                modification_state.value]
-
-    def _load_settings(self):
-        """Update device with stored settings"""
-        self._dll.LS_LoadSettings(self._serial_number)
-        return None
-
     def _open_laser(self) -> None:
         ret = self._dll.LS_Open(self._serial_number)
         self._check_error(ret)
@@ -193,10 +149,3 @@ class _Thorlabs_LS(_Thorlabs_Kinesis):
         ret = self._dll.LS_StartPolling(self._serial_number, ctypes.byref(pol))
         self._check_error(ret)
         return None
-
-    def _stop_polling(self):
-        self._dll.LS_StopPolling(self._serial_number)
-
-    def _clear_message_queue(self) -> None:
-        self._dll.LS_ClearMessageQueue(self._serial_number)
-        return None
@@ -7,11 +7,34 @@ Authors:
 import os
 import sys
 import ctypes
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from qcodes.instrument import Instrument
 from . import GeneralErrors, MotorErrors, ConnexionErrors
 
+# Error code: (exception type, message), merged once from the error tables
+_ERRORS: Dict[int, Tuple[type, str]] = {
+    **{code: (ConnectionError, msg) for code, msg in ConnexionErrors.items()},
+    **{code: (OSError, msg) for code, msg in GeneralErrors.items()},
+    **{code: (RuntimeError, msg) for code, msg in MotorErrors.items()},
+}
+# Direct-index view of _ERRORS; all known codes are below 0x30
+_ERRORS_BY_CODE: Tuple[Optional[Tuple[type, str]], ...] = tuple(
+    _ERRORS.get(code) for code in range(max(_ERRORS) + 1))
+_UNKNOWN_ERROR: Tuple[type, str] = (ValueError, 'Unknown error code')
+
+# Argument types of the <prefix>_GetHardwareInfo functions
+_HARDWARE_INFO_ARGTYPES: List[Any] = [
+    ctypes.c_char_p, ctypes.c_char_p, ctypes.c_ulong,
+    ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(ctypes.c_ushort),
+    ctypes.c_char_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong),
+    ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(ctypes.c_ushort)]
+
+# Loaded Kinesis DLLs, shared by all instruments using the same dll_path
+_DLL_CACHE: Dict[str, ctypes.CDLL] = {}
+# Handles of the directories added to the DLL search path, keyed by path
+_DLL_DIRECTORIES: Dict[str, Any] = {}
+
 class _Thorlabs_Kinesis(Instrument):
     """A base class for Thorlabs kinesis instruments
 
@@ -22,6 +45,11 @@ class _Thorlabs_Kinesis(Instrument):
         dll_dir: Directory in which the kinesis dll are stored.
         simulation: Enables the simulation manager. Defaults to False.
     """
+    # Prefix of the device-specific DLL functions, e.g. 'CC' or 'LS'
+    _prefix = ''
+    # DLL function name: (argtypes, restype), declared once after loading
+    _dll_signatures: Dict[str, Tuple[List[Any], Any]] = {}
+
     def __init__(self,
                  name: str,
                  serial_number: str,
@@ -38,8 +66,10 @@ class _Thorlabs_Kinesis(Instrument):
             self._dll: Any = None
             raise OSError('Thorlabs Kinesis only works on Windows')
         else:
-            os.add_dll_directory(self._dll_dir)
-            self._dll = ctypes.cdll.LoadLibrary(self._dll_path)
+            if self._dll_dir not in _DLL_DIRECTORIES:
+                _DLL_DIRECTORIES[self._dll_dir] = os.add_dll_directory(
+                    self._dll_dir)
+            self._load_dll(self._dll_path)
 
         self._simulation = simulation
         if self._simulation:
@@ -60,6 +90,24 @@ class _Thorlabs_Kinesis(Instrument):
         self._is_rack = self._device_info['is_rack']
         self._max_channels = self._device_info['max_channels']
 
+    def _load_dll(self, dll_path: str) -> None:
+        """Load the kinesis dll, or reuse it if another instrument already
+        loaded it, so that the resolved DLL functions are shared"""
+        dll = _DLL_CACHE.get(dll_path)
+        if dll is None:
+            dll = ctypes.cdll.LoadLibrary(dll_path)
+            _DLL_CACHE[dll_path] = dll
+        self._dll = dll
+        self._set_dll_signatures()
+
+    def _set_dll_signatures(self) -> None:
+        """Declare the argument and return types of the DLL functions in
+        ``_dll_signatures``, so that ctypes does not infer them per call"""
+        for name, (argtypes, restype) in self._dll_signatures.items():
+            func = getattr(self._dll, name)
+            func.argtypes = argtypes
+            func.restype = restype
+
     def _get_device_info(self) -> list:
         """Get the device information from the USB port
 
@@ -97,20 +145,79 @@ class _Thorlabs_Kinesis(Instrument):
                 is_laser.value, is_custom_type.value, is_rack.value,
                 max_channels.value]
 
-    def _check_error(self, status: int) -> None:
-        if status != 0:
-            if status in ConnexionErrors:
-                raise ConnectionError(f'{ConnexionErrors[status]} ({status})')
-            elif status in GeneralErrors:
-                raise OSError(f'{GeneralErrors[status]} ({status})')
-            elif status in MotorErrors:
-                raise RuntimeError(f'{MotorErrors[status]} ({status})')
-            else:
-                raise ValueError(f'Unknown error code ({status})')
-        else:
-            pass
+    def _dll_function(self, name: str) -> Any:
+        """Get the device-specific DLL function ``<prefix>_<name>``"""
+        return getattr(self._dll, f'{self._prefix}_{name}')
+
+    def identify(self) -> None:
+        """Sends a command to the device to make it identify itself"""
+        self.log.debug('identify the device')
+        self._dll_function('Identify')(self._serial_number)
+
+    def get_idn(self) -> dict:
+        """Get device identifier"""
+        idparts = ['Thorlabs', self.model, self.version, self.serial_number]
+        return dict(zip(('vendor', 'model', 'serial', 'firmware'), idparts))
+
+    def close(self):
+        self.log.info('close the device')
+        if self._simulation:
+            self.disable_simulation()
+        if hasattr(self, '_serial_number'):
+            self._stop_polling()
+            self._dll_function('Close')(self._serial_number)
+
+    def _get_hardware_info(self) -> list:
+        """Gets the hardware information from the device
+
+        Returns:
+            list: [model number, hardware type number, number of channels,
+                notes describing the device, firmware version, hardware version,
+                hardware modification state]
+        """
+        model = ctypes.create_string_buffer(8)
+        type_num = ctypes.c_ushort()
+        channel_num = ctypes.c_ushort()
+        notes = ctypes.create_string_buffer(48)
+        firmware_version = ctypes.c_ulong()
+        hardware_version = ctypes.c_ushort()
+        modification_state = ctypes.c_ushort()
+
+        ret = self._dll_function('GetHardwareInfo')(
+            self._serial_number,
+            model, len(model),
+            ctypes.byref(type_num), ctypes.byref(channel_num),
+            notes, len(notes), ctypes.byref(firmware_version),
+            ctypes.byref(hardware_version), ctypes.byref(modification_state)
+        )
+
+        self._check_error(ret)
+        return [model.value, type_num.value, channel_num.value,
+                notes.value, firmware_version.value, hardware_version.value,
+                modification_state.value]
+
+    def _load_settings(self):
+        """Update device with stored settings"""
+        self.log.info('update the device with the stored settings')
+        self._dll_function('LoadSettings')(self._serial_number)
+        return None
+
+    def _stop_polling(self) -> None:
+        self.log.info('stop polling')
+        self._dll_function('StopPolling')(self._serial_number)
+
+    def _clear_message_queue(self) -> None:
+        self.log.info('clear messages queue')
+        self._dll_function('ClearMessageQueue')(self._serial_number)
         return None
 
+    def _check_error(self, status: int) -> None:
+        if status:
+            entry = (_ERRORS_BY_CODE[status]
+                     if 0 < status < len(_ERRORS_BY_CODE) else None)
+            error, message = entry or _UNKNOWN_ERROR
+            raise error(f'{message} ({status})')
+
     def enable_simulation(self) -> None:
         """Initialise a connection to the simulation manager, which must already be running"""
         self._dll.TLI_InitializeSimulations()
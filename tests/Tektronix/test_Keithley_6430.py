@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+from qcodes_contrib_drivers.drivers.Tektronix.Keithley_6430 import Keithley_6430
+
+
+@pytest.fixture(scope="function")
+def driver():
+    keithley_sim = Keithley_6430(
+        "keithley_sim",
+        "GPIB::1::INSTR",
+        read_cache_ttl=10,
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Keithley_6430.yaml",
+    )
+    yield keithley_sim
+
+    keithley_sim.close()
+
+
+def count_reads(ask_raw):
+    return sum(1 for c in ask_raw.call_args_list if c.args[0] == ':READ?')
+
+
+def test_init(driver):
+    idn_dict = driver.IDN()
+
+    assert idn_dict["vendor"] == "KEITHLEY INSTRUMENTS INC."
+
+
+def test_sense_all(driver):
+    assert driver.sense_all() == (1.0, 2e-6, 5e5)
+
+
+def test_sense_parameters_share_one_reading(driver):
+    with patch.object(driver, 'ask_raw', wraps=driver.ask_raw) as ask_raw:
+        assert driver.sense_voltage() == 1.0
+        assert driver.sense_current() == 2e-6
+        assert driver.sense_resistance() == 5e5
+        assert count_reads(ask_raw) == 1
+
+
+def test_repeated_get_triggers_new_reading(driver):
+    with patch.object(driver, 'ask_raw', wraps=driver.ask_raw) as ask_raw:
+        for _ in range(3):
+            driver.sense_voltage()
+        assert count_reads(ask_raw) == 3
+
+        driver.sense_all()
+        driver.sense_current()
+        assert count_reads(ask_raw) == 5
+
+
+def test_write_invalidates_reading(driver):
+    with patch.object(driver, 'ask_raw', wraps=driver.ask_raw) as ask_raw:
+        driver.sense_voltage()
+        driver.nplc(2)
+        driver.sense_current()
+        assert count_reads(ask_raw) == 2
+
+
+def test_read_cache_ttl(driver):
+    with patch.object(driver, 'ask_raw', wraps=driver.ask_raw) as ask_raw:
+        driver.read_cache_ttl = 0
+        driver.sense_voltage()
+        driver.sense_current()
+        assert count_reads(ask_raw) == 2
+
+
+def test_read_cache_off_by_default():
+    keithley_sim = Keithley_6430(
+        "keithley_sim_default",
+        "GPIB::1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Keithley_6430.yaml",
+    )
+    try:
+        assert keithley_sim.read_cache_ttl == 0
+        with patch.object(keithley_sim, 'ask_raw',
+                          wraps=keithley_sim.ask_raw) as ask_raw:
+            keithley_sim.sense_voltage()
+            keithley_sim.sense_current()
+            assert count_reads(ask_raw) == 2
+    finally:
+        keithley_sim.close()
+
+
+def test_read_many_restores_trigger_count(driver):
+    driver.trigger_count(1)
+
+    data = driver.read_many(2)
+
+    assert data.tolist() == [[1.0, 2e-6, 5e5], [3.0, 4e-6, 7.5e5]]
+    driver.trigger_count.cache.invalidate()
+    assert int(driver.trigger_count()) == 1
+
+
+def test_read_is_not_reused(driver):
+    with patch.object(driver, 'ask_raw', wraps=driver.ask_raw) as ask_raw:
+        driver.read()
+        driver.sense_all()
+        driver.read()
+        assert count_reads(ask_raw) == 3
@@ -0,0 +1,151 @@
+import ctypes
+import os
+import sys
+
+import pytest
+from qcodes_contrib_drivers.drivers.Thorlabs.KDC101 import Thorlabs_KDC101
+from qcodes_contrib_drivers.drivers.Thorlabs.private import CC, kinesis
+
+
+class FakeFunction:
+    """Stand-in for a ctypes function of the Kinesis DLL"""
+
+    def __init__(self, dll, name, impl):
+        self.dll = dll
+        self.name = name
+        self.impl = impl
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args):
+        self.dll.calls.append(self.name)
+        return self.impl(*args)
+
+
+class FakeKinesisDLL:
+    """Fake Kinesis DLL with 1000 device units per real unit. Functions
+    without a ``fake_`` implementation succeed and do nothing."""
+
+    def __init__(self):
+        self.calls = []
+        self.status_bits = 0
+        self.vel_params = [2000, 1000]
+        self._functions = {}
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name not in self._functions:
+            impl = getattr(type(self), f'fake_{name}', None)
+            self._functions[name] = FakeFunction(
+                self, name, (lambda *args: 0) if impl is None
+                else impl.__get__(self))
+        return self._functions[name]
+
+    def fake_CC_GetHardwareInfo(self, serial_number, model, *args):
+        model.value = b'KDC101'
+        return 0
+
+    def fake_CC_GetStatusBits(self, serial_number):
+        return self.status_bits
+
+    def fake_CC_GetVelParams(self, serial_number, accel, vel):
+        accel._obj.value, vel._obj.value = self.vel_params
+        return 0
+
+    def fake_CC_SetVelParams(self, serial_number, accel, vel):
+        self.vel_params = [accel, vel]
+        return 0
+
+    def fake_CC_GetRealValueFromDeviceUnit(self, serial_number, device_unit,
+                                           real_unit, unit_type):
+        real_unit._obj.value = device_unit / 1000
+        return 0
+
+    def fake_CC_GetDeviceUnitFromRealValue(self, serial_number, real_unit,
+                                           device_unit, unit_type):
+        device_unit._obj.value = round(real_unit * 1000)
+        return 0
+
+
+@pytest.fixture(scope="function")
+def dll():
+    return FakeKinesisDLL()
+
+
+@pytest.fixture(scope="function")
+def driver(dll, monkeypatch):
+    monkeypatch.setattr(kinesis, '_DLL_CACHE', {})
+    monkeypatch.setattr(kinesis, '_DLL_DIRECTORIES', {})
+    monkeypatch.setattr(ctypes.cdll, 'LoadLibrary', lambda path: dll)
+    monkeypatch.setattr(os, 'add_dll_directory', lambda path: None,
+                        raising=False)
+    monkeypatch.setattr(CC, 'sleep', lambda t: None)
+    with monkeypatch.context() as m:
+        m.setattr(sys, 'platform', 'win32')
+        kdc = Thorlabs_KDC101('kdc_sim', '27000001')
+    dll.calls.clear()
+    yield kdc
+
+    kdc.close()
+    kdc.remove_instance(kdc)
+
+
+@pytest.mark.parametrize('status_bits, moving', [
+    (0x00, False), (0x10, True), (0x20, True), (0x30, True), (0x400, False)])
+def test_is_moving(driver, dll, status_bits, moving):
+    dll.status_bits = status_bits
+
+    assert driver.is_moving() is moving
+
+
+def test_status_bits_read_once_per_polling_period(driver, dll):
+    driver.is_moving()
+    driver.is_moving()
+    assert dll.calls.count('CC_GetStatusBits') == 1
+
+    driver.move_continuous()
+    driver.is_moving()
+    assert dll.calls.count('CC_GetStatusBits') == 2
+
+
+@pytest.mark.parametrize('status, error', [
+    (0x02, ConnectionError),
+    (0x21, OSError),
+    (0x25, RuntimeError),
+    (0x2F, RuntimeError),
+    (0x16, ValueError),
+    (0x99, ValueError),
+    (-1, ValueError)])
+def test_check_error(driver, status, error):
+    with pytest.raises(error, match=f'\\({status}\\)'):
+        driver._check_error(status)
+
+
+def test_check_error_success(driver):
+    driver._check_error(0)
+
+
+def test_vel_params(driver, dll):
+    driver.vel_params((2.0, 3.0))
+
+    assert dll.vel_params == [3000, 2000]
+    assert driver.velocity.cache.get() == 2.0
+    assert driver.acceleration.cache.get() == 3.0
+    assert dll.calls.count('CC_SetVelParams') == 1
+
+
+def test_vel_params_read_once_per_polling_period(driver, dll):
+    assert driver.velocity() == 1.0
+    assert driver.acceleration() == 2.0
+    assert driver.vel_params() == (1.0, 2.0)
+    assert dll.calls.count('CC_GetVelParams') == 1
+
+
+def test_velocity_keeps_device_acceleration(driver, dll):
+    dll.vel_params = [40000, 1000]
+
+    driver.velocity(2.0)
+
+    assert dll.vel_params == [40000, 2000]
+    assert driver.acceleration.cache.get() == 40.0